@@ -1,8 +1,6 @@
 import pytest
 from _pytest.config import PytestPluginManager, hookimpl
 
-from pytest_richtrace.plugin import PytestRichTrace
-
 
 def pytest_addoption(parser: pytest.Parser, pluginmanager: PytestPluginManager) -> None:
     """
@@ -16,6 +14,18 @@ def pytest_addoption(parser: pytest.Parser, pluginmanager: PytestPluginManager)
         action="store_true",
         help="Enable the richtrace plugin",
     )
+    group.addoption(
+        "--rich-trace-collection",
+        dest="rich_trace_collection",
+        action="store_true",
+        help="Trace the collection hooks (default is to trace all hooks)",
+    )
+    group.addoption(
+        "--rich-trace-runtest",
+        dest="rich_trace_runtest",
+        action="store_true",
+        help="Trace the test execution hooks (default is to trace all hooks)",
+    )
     group.addoption(
         "--output-svg",
         dest="output_svg",
@@ -45,6 +55,18 @@ def pytest_configure(config: pytest.Config) -> None:
     :param config: The pytest config object
     """
     if config.option.rich_trace:
+        option = config.option
+        if getattr(option, "quiet", 0):
+            # Only the results are output in quiet mode so no hooks are traced
+            option.rich_trace_collection = False
+            option.rich_trace_runtest = False
+        elif not (option.rich_trace_collection or option.rich_trace_runtest):
+            option.rich_trace_collection = True
+            option.rich_trace_runtest = True
+
+        # Only import rich & pydantic when the plugin is used
+        from pytest_richtrace.plugin import PytestRichTrace
+
         reporter = config.pluginmanager.get_plugin("terminalreporter")
         config.pluginmanager.unregister(plugin=reporter)
 
@@ -5,15 +5,16 @@ from pathlib import Path
 
 import pytest
 from _pytest._py.path import LocalPath
-from _pytest.pathlib import import_path
 from _pytest.python import Class, Module
 from _pytest.skipping import evaluate_skip_marks, evaluate_xfail_marks
 
 from . import events
 from .event import SOURCE_ID_GENERATOR, EventBus, EventPublisher
-from .item import NodeId
+from .item import NodeId, marker_names
 from .results import SkipInfo, TestRunResults, XfailInfo
 
+logger = logging.getLogger(__name__)
+
 
 class CollectionObserver:
     results: TestRunResults
@@ -30,122 +31,82 @@ class CollectionObserver:
 
         source_id = source_id_generator()
         self.publisher = EventPublisher(source_id, event_bus)
+        self._publish = self.publisher.publish
+        self.trace = config.option.rich_trace_collection
+
+        self._collected_items: list[tuple[NodeId, dict[str, SkipInfo | XfailInfo]]] = []
 
     class CollectError(Exception):
         """An error during collection, contains a custom message."""
 
     @pytest.hookimpl(tryfirst=True)
     def pytest_collection(self, session: pytest.Session) -> None:
-        logging.debug("collector: pytest_collection")
+        logger.debug("collector: pytest_collection")
         location = session.nodeid if session.nodeid else None
 
         self.results.collect.start = datetime.now(tz=timezone.utc)
         self.results.collect.precise_start = time.perf_counter()
 
-        self.publisher.publish(
-            events.CollectionStarted,
-            item_id=location,
-            payload={
-                "session": session,
-            },
-        )
-        return None
-
-    @pytest.hookimpl
-    def pytest_collectstart(self, collector: pytest.Collector) -> None:
-        logging.debug("collector: pytest_collectstart")
-        self.publisher.publish(
-            events.CollectStart,
-            item_id=collector.nodeid,
-            payload={"collector": collector},
-        )
-        return None
-
-    @pytest.hookimpl
-    def pytest_make_collect_report(self, collector: pytest.Collector) -> None:
-        logging.debug("collector: pytest_make_collect_report")
-        self.publisher.publish(
-            events.CollectMakeReport,
-            item_id=collector.nodeid,
-            payload={"collector": collector},
+        # Skip building the event payloads when nothing would receive them
+        self.trace = (
+            self.config.option.rich_trace_collection
+            and self.publisher.has_subscribers()
         )
-        return None
 
-    @pytest.hookimpl
-    def pytest_collect_file(
-        self, file_path: Path, parent: pytest.Collector
-    ) -> pytest.Collector | None:
-        self.publisher.publish(
-            events.CollectFile,
-            item_id=str(file_path),
-            payload={"collector": parent},
-        )
+        if self.trace:
+            self._publish(
+                events.CollectionStarted,
+                item_id=location,
+                payload={
+                    "session": session,
+                },
+            )
         return None
 
     @pytest.hookimpl
     def pytest_pycollect_makemodule(
         self, module_path: Path, path: LocalPath, parent: pytest.Collector
     ) -> pytest.Module | None:
-        logging.debug("collector: pytest_pycollect_makemodule")
+        logger.debug("collector: pytest_pycollect_makemodule")
 
-        importmode = self.config.getoption("--import-mode")
-        try:
-            import_path(str(module_path), mode=importmode, root=self.config.rootpath)
-            self.publisher.publish(
+        if self.trace:
+            self._publish(
                 events.CollectPyModule,
                 item_id=parent.nodeid,
                 payload={"path": module_path},
             )
-        except Exception as exc:
-            self.results.collect.count += 1
-            self.results.collect.error[str(module_path)] = exc
-            self.publisher.publish(
-                events.ModuleCollectionError,
-                item_id=str(module_path),
-                payload={"path": module_path, "exception": exc},
-            )
-        finally:
-            return None
-
-    @pytest.hookimpl
-    def pytest_pycollect_makeitem(
-        self, collector: Module | Class, name: str, obj: object
-    ) -> pytest.Collector | None:
-        logging.debug("collector: pytest_pycollect_makeitem")
-
-        self.publisher.publish(
-            events.CollectPyFile,
-            item_id=collector.nodeid,
-            # payload={"path": file_path},
-        )
         return None
 
-    @pytest.hookimpl
+    @pytest.hookimpl(tryfirst=True)
     def pytest_itemcollected(self, item: pytest.Item) -> None:
-        logging.debug("collector: pytest_itemcollected")
+        """Record the skip/xfail marks of the item.
 
-        self.results.collect.count += 1
+        Runs first so that the reporter can use the recorded marks rather than
+        evaluating them again."""
+        logger.debug("collector: pytest_itemcollected")
 
-        markers = [mark.name for mark in item.iter_markers()]
+        self.results.collect.count += 1
 
         payload: dict[str, SkipInfo | XfailInfo] = {}
-        nodeid = NodeId(item.nodeid)
+        markers: list[str] | None = None
 
         skipped = evaluate_skip_marks(item)
         if skipped is not None:
-            skip_info = SkipInfo(
+            markers = marker_names(item)
+            skip_info = SkipInfo.model_construct(
                 reason=skipped.reason,
                 markers=markers,
             )
             # TODO: Check if we need to store multiple SkipInfo
-            if nodeid not in self.results.collect.skip:
-                self.results.collect.skip[nodeid] = []
-            self.results.collect.skip[nodeid].append(skip_info)
+            nodeid = NodeId(item.nodeid)
+            self.results.collect.skip.setdefault(nodeid, []).append(skip_info)
             payload["skipped"] = skip_info
 
         xfailed = evaluate_xfail_marks(item)
         if xfailed is not None:
-            xfail_info = XfailInfo(
+            if markers is None:
+                markers = marker_names(item)
+            xfail_info = XfailInfo.model_construct(
                 reason=xfailed.reason,
                 raises=xfailed.raises,
                 run=xfailed.run,
@@ -153,20 +114,147 @@ class CollectionObserver:
                 markers=markers,
             )
             # TODO: Check if we need to store multiple XFailInfo
-            if nodeid not in self.results.collect.xfail:
-                self.results.collect.xfail[nodeid] = []
-            self.results.collect.xfail[nodeid].append(xfail_info)
+            nodeid = NodeId(item.nodeid)
+            self.results.collect.xfail.setdefault(nodeid, []).append(xfail_info)
             payload["xfail"] = xfail_info
 
-        self.publisher.publish(
-            events.ItemCollected, item_id=item.nodeid, payload=payload
+        if self.trace:
+            self._collected_items.append((item.nodeid, payload))
+        return None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_make_collect_report(self, collector: pytest.Collector):
+        """Record the modules which pytest failed to import"""
+        logger.debug("collector: pytest_make_collect_report")
+        outcome = yield
+        if not isinstance(collector, Module):
+            return
+
+        report = outcome.get_result()
+        if not report.failed:
+            return
+
+        # The report only keeps the call info until pytest_collectreport
+        call = getattr(report, "call", None)
+        if call is None or call.excinfo is None:
+            return
+
+        # pytest wraps import errors in a CollectError so record the original
+        exc = call.excinfo.value
+        exc = exc.__cause__ or exc
+
+        module_path = collector.path
+        self.results.collect.count += 1
+        self.results.collect.error[str(module_path)] = exc
+        if self.trace:
+            self._publish(
+                events.ModuleCollectionError,
+                item_id=str(module_path),
+                payload={"path": module_path, "exception": exc},
+            )
+
+    @pytest.hookimpl
+    def pytest_deselected(self, items: list[pytest.Item]):
+        logger.debug("collector: pytest_deselected")
+        for item in items:
+            self.results.collect.deselected.append(item.nodeid)
+        if self.trace:
+            self._publish(
+                events.ItemsDeselected,
+                item_id=None,
+                payload={"items": items},
+            )
+        return None
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_finish(self, session: pytest.Session) -> None:
+        logger.debug("collector: pytest_collection_finish")
+        self.results.collect.finish = datetime.now(tz=timezone.utc)
+        self.results.collect.precise_finish = time.perf_counter()
+
+        if self.trace:
+            # Publish the collected items in one event rather than one per item
+            self.publisher.publish_many(
+                (
+                    (
+                        events.ItemsCollected,
+                        session.nodeid,
+                        {"items": self._collected_items},
+                    ),
+                    (
+                        events.CollectionFinished,
+                        session.nodeid,
+                        {"session": session},
+                    ),
+                )
+            )
+            self._collected_items = []
+        return None
+
+
+class CollectionTracer:
+    """Publishes the events for the collection hooks which are only traced"""
+
+    def __init__(
+        self,
+        config: pytest.Config,
+        event_bus: EventBus,
+        source_id_generator=SOURCE_ID_GENERATOR,
+    ):
+        self.config = config
+
+        source_id = source_id_generator()
+        self.publisher = EventPublisher(source_id, event_bus)
+        self._publish = self.publisher.publish
+
+    @pytest.hookimpl
+    def pytest_collectstart(self, collector: pytest.Collector) -> None:
+        logger.debug("collector: pytest_collectstart")
+        self._publish(
+            events.CollectStart,
+            item_id=collector.nodeid,
+            payload={"collector": collector},
+        )
+        return None
+
+    @pytest.hookimpl
+    def pytest_make_collect_report(self, collector: pytest.Collector) -> None:
+        logger.debug("collector: pytest_make_collect_report")
+        self._publish(
+            events.CollectMakeReport,
+            item_id=collector.nodeid,
+            payload={"collector": collector},
+        )
+        return None
+
+    @pytest.hookimpl
+    def pytest_collect_file(
+        self, file_path: Path, parent: pytest.Collector
+    ) -> pytest.Collector | None:
+        self._publish(
+            events.CollectFile,
+            item_id=str(file_path),
+            payload={"collector": parent},
+        )
+        return None
+
+    @pytest.hookimpl
+    def pytest_pycollect_makeitem(
+        self, collector: Module | Class, name: str, obj: object
+    ) -> pytest.Collector | None:
+        logger.debug("collector: pytest_pycollect_makeitem")
+
+        self._publish(
+            events.CollectPyFile,
+            item_id=collector.nodeid,
+            # payload={"path": file_path},
         )
         return None
 
     @pytest.hookimpl
     def pytest_collectreport(self, report: pytest.CollectReport) -> None:
-        logging.debug("collector: pytest_collectreport")
-        self.publisher.publish(
+        logger.debug("collector: pytest_collectreport")
+        self._publish(
             events.CollectReport,
             item_id=report.nodeid,
             payload={"report": report},
@@ -178,36 +266,10 @@ class CollectionObserver:
         self, session: pytest.Session, config: pytest.Config, items: list[pytest.Item]
     ) -> None:
         """Filter and re-order the list of tests"""
-        logging.debug("collector: pytest_collection_modifyitems")
-        self.publisher.publish(
+        logger.debug("collector: pytest_collection_modifyitems")
+        self._publish(
             events.ModifyItems,
             item_id=session.nodeid,
             payload={"items": items},
         )
         return None
-
-    @pytest.hookimpl
-    def pytest_deselected(self, items: list[pytest.Item]):
-        logging.debug("collector: pytest_deselected")
-        for item in items:
-            self.results.collect.deselected.append(item.nodeid)
-        self.publisher.publish(
-            events.ItemsDeselected,
-            item_id=None,
-            payload={"items": items},
-        )
-        return None
-
-    @pytest.hookimpl(trylast=True)
-    def pytest_collection_finish(self, session: pytest.Session) -> None:
-        logging.debug("collector: pytest_collection_finish")
-        self.results.collect.finish = datetime.now(tz=timezone.utc)
-        self.results.collect.precise_finish = time.perf_counter()
-        self.publisher.publish(
-            events.CollectionFinished,
-            session.nodeid,
-            payload={
-                "session": session,
-            },
-        )
-        return None
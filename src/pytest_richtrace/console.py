@@ -1,22 +1,30 @@
-from textwrap import indent, wrap
+import functools
+from textwrap import indent
 
 from rich import console
+from rich.markup import escape
+from rich.padding import Padding
+from rich.text import Text
 
 INDENT = "    "
 MIN_WIDTH = 100
 
 
+@functools.lru_cache(maxsize=128)
+def _hook_label(name: str, prefix: str) -> Text:
+    return Text.from_markup(f"{prefix}[hook]hook[/]: [hookname]{name:<28}[/]")
+
+
 def format_hook_info(
     name: str,
     info: str = "",
     prefix: str = "",
-) -> str:
-    name = name.ljust(28, " ")
+) -> Text:
+    text = _hook_label(name, prefix).copy()
     if info:
-        info = info.replace("[", "\\[")
-        return f"{prefix}[hook]hook[/]: [hookname]{name}[/] [white]{info}[/]"
-    else:
-        return f"{prefix}[hook]hook[/]: [hookname]{name}[/]"
+        text.append(" ")
+        text.append(info, style="white")
+    return text
 
 
 def print_hook_info(
@@ -29,6 +37,7 @@ def print_hook_info(
     console.print(output)
 
 
+@functools.lru_cache(maxsize=64)
 def format_separator(
     text: str = "",
     separator="=",
@@ -36,7 +45,7 @@ def format_separator(
     width: int = 80,
 ) -> str:
     if text != "":
-        char_count = int((width - (len(text) + 2)) / 2)
+        char_count = (width - (len(text) + 2)) // 2
         chars = separator * char_count
         sep = chars + f" {text} " + chars
 
@@ -80,21 +89,12 @@ def format_value(
     prefix: str = "",
     color: str = "white",
     wrap_text: bool = True,
-    width: int = 80,
-) -> str:
+) -> console.RenderableType:
     if wrap_text:
-        value = "\n".join(
-            wrap(
-                value,
-                initial_indent=prefix,
-                subsequent_indent=prefix,
-                width=width - len(prefix) - 8,
-            )
-        )
+        # Rich wraps the text when printed, indenting each line by the prefix
+        return Padding(Text(value, style=color), (0, 0, 0, len(prefix)), expand=False)
     else:
-        value = indent(value, prefix=prefix)
-    value = value.replace("[", "\\[")
-    return f"[{color}]{value}[/]"
+        return f"[{color}]{escape(indent(value, prefix=prefix))}[/]"
 
 
 def print_value(
@@ -104,7 +104,7 @@ def print_value(
     color: str = "white",
     wrap_text: bool = True,
 ) -> None:
-    output = format_value(value, prefix, color, wrap_text, width=console.width)
+    output = format_value(value, prefix, color, wrap_text)
     console.print(output)
 
 
@@ -115,8 +115,7 @@ def format_key_value(
     key_color="keyname",
     value_color="white",
 ) -> str:
-    value = value.replace("[", "\\[")
-    return f"{prefix}[{key_color}]{key}[/]: [{value_color}]{value}[/]"
+    return f"{prefix}[{key_color}]{key}[/]: [{value_color}]{escape(value)}[/]"
 
 
 def print_key_value(
@@ -1,33 +1,37 @@
+import itertools
+from collections import deque
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Any, Callable
+from time import perf_counter_ns
+from typing import Any
 from uuid import uuid1
 
 from .item import ItemId
 
-EventId = str
+EventId = int
 EventName = str
 EventSource = str
 
 
-@dataclass
 class Event:
-    id: EventId = ""
-    source: EventSource = ""
-    name: EventName = ""
-    item_id: ItemId | None = ""
-    time: datetime | None = None
-    payload: Any | None = None
-
-    def __init__(self, event_info: dict[str, Any] | None = None):
-        if event_info is None:
-            return
-        self.id = event_info.get("id", "")
-        self.source = event_info.get("source", "")
-        self.time = event_info.get("time", None)
-        self.name = event_info.get("name", "")
-        self.item_id = event_info.get("item_id", None)
-        self.payload = event_info.get("payload", None)
+    __slots__ = ("id", "source", "name", "item_id", "time", "payload")
+
+    def __init__(
+        self,
+        *,
+        id: EventId = 0,
+        source: EventSource = "",
+        name: EventName = "",
+        item_id: ItemId | None = None,
+        time: int | None = None,
+        payload: Any | None = None,
+    ):
+        self.id = id
+        self.source = source
+        self.name = name
+        self.item_id = item_id
+        self.time = time
+        self.payload = payload
 
     def __rich_repr__(self):
         yield "id", self.id
@@ -44,22 +48,23 @@ class Event:
 EventCallback = Callable[[Event], None]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SubscriptionInfo:
     source: EventSource
     func: EventCallback
 
 
-IdGenerator = Callable[[], str]
-DatetimeGenerator = Callable[[], datetime]
+IdGenerator = Callable[[], EventId]
+Clock = Callable[[], int]
 
 
-def CLOCK() -> datetime:
-    return datetime.now(tz=timezone.utc)
+# Event times are perf counter nanoseconds, which are far cheaper to read
+# than the wall clock
+CLOCK: Clock = perf_counter_ns
 
 
-def EVENT_ID_GENERATOR() -> str:
-    return str(uuid1())
+# Event IDs only need to be unique within a test run
+EVENT_ID_GENERATOR: IdGenerator = itertools.count(1).__next__
 
 
 def SOURCE_ID_GENERATOR() -> str:
@@ -70,10 +75,30 @@ class EventBus:
     def __init__(
         self,
         event_id_generator: IdGenerator = EVENT_ID_GENERATOR,
-        clock: DatetimeGenerator = CLOCK,
+        clock: Clock = CLOCK,
+        retain: bool = True,
+        max_events: int | None = None,
     ) -> None:
+        """Create an event bus.
+
+        Published events are kept for `get_with_id` and `get_from_source`
+        unless `retain` is False. `max_events` limits the number kept to the
+        most recent events, it must be at least 1 and is ignored when `retain`
+        is False.
+        """
+        if max_events is not None and max_events < 1:
+            raise ValueError(f"max_events must be at least 1, not {max_events}")
+
         self.events: dict[EventId, Event] = {}
+        self._events_by_source: dict[EventSource, deque[Event]] = {}
+        self._retain = retain
+        self._retained_ids: deque[EventId] | None = (
+            deque(maxlen=max_events) if max_events is not None else None
+        )
         self.subscriptions: list[SubscriptionInfo] = []
+        # The callbacks to notify for events from each source, built the first
+        # time a source publishes and reset when a subscription is added
+        self._recipients: dict[EventSource, list[EventCallback]] = {}
         self._event_id_generator = event_id_generator
         self._clock = clock
 
@@ -81,37 +106,73 @@ class EventBus:
         self,
         event: Event,
     ) -> EventId:
-        event_id = str(self._event_id_generator())
-        event_time = self._clock()
-        new_event = Event(
-            {
-                "id": event_id,
-                "source": event.source,
-                "time": event_time,
-                "name": event.name,
-                "item_id": event.item_id,
-                "payload": event.payload,
-            }
-        )
+        event.id = event_id = self._event_id_generator()
+        event.time = self._clock()
 
-        self.events[event_id] = new_event
-        self._notify(new_event)
+        if self._retain:
+            self._store(event)
+        self._notify(event)
         return event_id
 
+    def publish_many(self, events: Iterable[Event]) -> list[EventId]:
+        """Publish several events in order, each stored before it is notified"""
+        event_id_generator = self._event_id_generator
+        clock = self._clock
+        store = self._store if self._retain else None
+        notify = self._notify
+
+        event_ids: list[EventId] = []
+        for event in events:
+            event.id = event_id = event_id_generator()
+            event.time = clock()
+            if store is not None:
+                store(event)
+            notify(event)
+            event_ids.append(event_id)
+        return event_ids
+
+    def _store(self, event: Event) -> None:
+        ids = self._retained_ids
+        if ids is not None:
+            # Forget the oldest event before the deque drops its id
+            if len(ids) == ids.maxlen:
+                oldest = self.events.pop(ids[0], None)
+                if oldest is not None:
+                    self._events_by_source[oldest.source].popleft()
+            ids.append(event.id)
+        self.events[event.id] = event
+        self._events_by_source.setdefault(event.source, deque()).append(event)
+
     def get_with_id(self, event_id: EventId) -> Event | None:
         return self.events.get(event_id, None)
 
     def get_from_source(self, source: EventSource) -> list[Event]:
-        return [item for item in self.events.values() if item.source == source]
+        return list(self._events_by_source.get(source, ()))
 
     def subscribe(self, source: EventSource, func: EventCallback) -> None:
         subscription = SubscriptionInfo(source, func)
         self.subscriptions.append(subscription)
+        self._recipients.clear()
+
+    def has_subscribers(self, source: EventSource) -> bool:
+        """Whether any subscriber is notified of the events from `source`"""
+        return bool(self._callbacks_for(source))
+
+    def _callbacks_for(self, source: EventSource) -> list[EventCallback]:
+        callbacks = self._recipients.get(source, None)
+        if callbacks is None:
+            # Subscribers are not notified of events from their own source
+            callbacks = [
+                subscription.func
+                for subscription in self.subscriptions
+                if subscription.source != source
+            ]
+            self._recipients[source] = callbacks
+        return callbacks
 
     def _notify(self, event: Event):
-        for subscription in self.subscriptions:
-            if subscription.source != event.source:
-                subscription.func(event)
+        for func in self._callbacks_for(event.source):
+            func(event)
 
 
 class EventPublisher:
@@ -122,6 +183,7 @@ class EventPublisher:
     ):
         self.event_bus = event_bus
         self.source_id = source_id
+        self._publish = event_bus.publish
 
     def publish(
         self,
@@ -129,12 +191,20 @@ class EventPublisher:
         item_id: ItemId | None = None,
         payload: Any | None = None,
     ) -> EventId:
-        ev = Event(
-            {
-                "source": self.source_id,
-                "name": name,
-                "item_id": item_id,
-                "payload": payload,
-            }
+        return self._publish(
+            Event(source=self.source_id, name=name, item_id=item_id, payload=payload)
+        )
+
+    def has_subscribers(self) -> bool:
+        return self.event_bus.has_subscribers(self.source_id)
+
+    def publish_many(
+        self,
+        events: Iterable[tuple[EventName, ItemId | None, Any | None]],
+    ) -> list[EventId]:
+        """Publish several (name, item_id, payload) events in one bus call"""
+        source_id = self.source_id
+        return self.event_bus.publish_many(
+            Event(source=source_id, name=name, item_id=item_id, payload=payload)
+            for name, item_id, payload in events
         )
-        return self.event_bus.publish(ev)
@@ -1,5 +1,11 @@
 from .event import EventName
 
+# Event names are plain strings rather than an IntEnum. Publishers and the
+# reporter's handler table use these same objects, so a dispatch lookup uses
+# the string's cached hash and an identity check, which is as quick as an
+# IntEnum key. Converting them would gain nothing and would change the names in
+# the JSON output and for every subscriber.
+
 Environment: EventName = "test:run:environment"
 
 TestRunStarted: EventName = "test:run:started"
@@ -22,8 +28,8 @@ CollectPyModule: EventName = "test:collect:py:module"
 # Collect items in a Python file
 CollectPyFile: EventName = "test:collect:py:file"
 
-# Item to be tested has been collected
-ItemCollected: EventName = "test:item:collected"
+# Items to be tested have been collected
+ItemsCollected: EventName = "test:items:collected"
 
 ModifyItems: EventName = "test:collect:modify_items"
 
@@ -45,5 +51,4 @@ ExecuteItemStarted: EventName = "test:execute:item:started"
 ExecuteItemSetup: EventName = "test:execute:item:setup"
 ExecuteItemCall: EventName = "test:execute:item:call"
 ExecuteItemTeardown: EventName = "test:execute:item:teardown"
-ExecuteItemReport: EventName = "test:execute:item:report"
 ExecuteItemFinished: EventName = "test:execute:item:finished"
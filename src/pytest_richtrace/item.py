@@ -1,3 +1,16 @@
+import pytest
+
 NodeId = str
 ModuleId = str
 ItemId = NodeId | ModuleId
+
+MARKER_NAMES_KEY = pytest.StashKey[list[str]]()
+
+
+def marker_names(item: pytest.Item) -> list[str]:
+    """Return the names of an item's markers, cached in the item's stash"""
+    names = item.stash.get(MARKER_NAMES_KEY, None)
+    if names is None:
+        names = [mark.name for mark in item.iter_markers()]
+        item.stash[MARKER_NAMES_KEY] = names
+    return names
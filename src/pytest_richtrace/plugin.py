@@ -1,3 +1,4 @@
+import functools
 import logging
 import platform
 import sys
@@ -10,10 +11,11 @@ import _pytest
 import pluggy  # type: ignore
 import pytest
 import rich.console
+import rich.theme
 from _pytest.main import Session
 
 from . import events
-from .collection_observer import CollectionObserver
+from .collection_observer import CollectionObserver, CollectionTracer
 from .console import print_separator
 from .event import SOURCE_ID_GENERATOR, EventBus, EventPublisher
 from .item import ItemId
@@ -21,6 +23,36 @@ from .results import TestRunResults
 from .rich_reporter import RichReporter
 from .test_execution_observer import TestExecutionObserver
 
+logger = logging.getLogger(__name__)
+
+_THEME = rich.theme.Theme(
+    styles={
+        "hook": "green",
+        "hookname": "yellow",
+        "keyname": "blue",
+        "item": "white",
+        "passed": "green",
+        "failed": "red",
+        "skipped": "orange3",
+        "error": "bright_red",
+        "separator": "green",
+        "xfailed": "dark_orange",
+        "xpassed": "orange1",
+        "deselected": "dim white",
+    }
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _static_environment() -> dict[str, str]:
+    """The parts of the environment which cannot change during a process"""
+    return {
+        "platform": sys.platform,
+        "python": platform.python_version(),
+        "pytest_version": _pytest.__version__,
+        "pluggy_version": pluggy.__version__,
+    }
+
 
 class PytestRichTrace:
     def __init__(
@@ -28,14 +60,14 @@ class PytestRichTrace:
         config: pytest.Config,
         source_id_generator=SOURCE_ID_GENERATOR,
     ):
-        logging.basicConfig(level=logging.INFO)
-
         self.config = config
         self.location = config.rootpath
-        self.quiet = "quiet" in config.option
+        self.quiet = bool(getattr(config.option, "quiet", 0))
         self.console = self._create_console(config)
+        self.output_json = getattr(config.option, "output_json", None)
 
-        self.event_bus = EventBus()
+        # Events are handled as they are published and never looked up later
+        self.event_bus = EventBus(retain=False)
         self.source_id = source_id_generator()
         self.publisher = EventPublisher(self.source_id, self.event_bus)
 
@@ -47,7 +79,7 @@ class PytestRichTrace:
     def pytest_sessionstart(self, session: Session) -> None:
         """Publish a ConfigLoaded and a TestRunStarted event."""
 
-        logging.debug("session: pytest_sessionstart")
+        logger.debug("session: pytest_sessionstart")
         if not self.quiet:
             print_separator(self.console, "Pytest Rich Trace", color="blue")
 
@@ -65,7 +97,7 @@ class PytestRichTrace:
     @pytest.hookimpl(trylast=True)
     def pytest_sessionfinish(self, session: Session) -> None:
         """Publish a TestRunFinished event"""
-        logging.debug("session: pytest_sessionfinish")
+        logger.debug("session: pytest_sessionfinish")
 
         finish_time = datetime.now(tz=timezone.utc)
         self.results.finish = finish_time
@@ -76,9 +108,10 @@ class PytestRichTrace:
         item_id = session.nodeid if session.nodeid else ""
         self._test_run_finished(item_id)
 
-        if "output_json" in self.config.option and self.config.option.output_json:
-            data = self.results.model_dump_json(indent=4)
-            with open(self.config.option.output_json, "w") as fp:
+        if self.output_json:
+            # Compact JSON, indenting a large nodes dict costs more than it's worth
+            data = self.results.model_dump_json()
+            with open(self.output_json, "w") as fp:
                 fp.write(data)
 
     def duration(self) -> timedelta:
@@ -104,42 +137,22 @@ class PytestRichTrace:
         return finish - start
 
     def _create_console(self, config):
-        record = False
-        self.output_svg = None
-        if "output_svg" in config.option and config.option.output_svg is not None:
-            record = True
-            self.output_svg = self.config.option.output_svg
-
-        self.output_html = None
-        if "output_html" in config.option and config.option.output_html is not None:
-            record = True
-            self.output_html = self.config.option.output_html
-
-        self.output_text = None
-        if "output_text" in config.option and config.option.output_text is not None:
-            record = True
-            self.output_text = self.config.option.output_text
-
-        self.theme = rich.theme.Theme(
-            styles={
-                "hook": "green",
-                "hookname": "yellow",
-                "keyname": "blue",
-                "item": "white",
-                "passed": "green",
-                "failed": "red",
-                "skipped": "orange3",
-                "error": "bright_red",
-                "separator": "green",
-                "xfailed": "dark_orange",
-                "xpassed": "orange1",
-                "deselected": "dim white",
-            }
+        option = config.option
+        self.output_svg = getattr(option, "output_svg", None)
+        self.output_html = getattr(option, "output_html", None)
+        self.output_text = getattr(option, "output_text", None)
+        record = any(
+            path is not None
+            for path in (self.output_svg, self.output_html, self.output_text)
         )
 
+        self.theme = _THEME
+
         no_color = config.option.color == "no"
 
-        return rich.console.Console(theme=self.theme, record=record, no_color=no_color)
+        return rich.console.Console(
+            theme=self.theme, record=record, no_color=no_color, highlight=False
+        )
 
     def _create_plugins(self, config):
         self.collector = CollectionObserver(config, self.results, self.event_bus)
@@ -150,26 +163,32 @@ class PytestRichTrace:
 
         config.pluginmanager.register(self, name="richtrace_session")
         config.pluginmanager.register(self.collector, name="richtrace_collection")
+        if config.option.rich_trace_collection:
+            self.collection_tracer = CollectionTracer(config, self.event_bus)
+            config.pluginmanager.register(
+                self.collection_tracer, name="richtrace_collection_tracer"
+            )
         config.pluginmanager.register(self.runtest, name="richtrace_testrun")
-        config.pluginmanager.register(self.writer, name="richtrace_richreporter")
+        if config.option.rich_trace_collection:
+            config.pluginmanager.register(self.writer, name="richtrace_richreporter")
 
     def _collect_environment(self) -> dict[str, Any]:
         env: dict[str, str | list[str] | pytest.Config] = {}
-        env["platform"] = sys.platform
-        env["python"] = platform.python_version()
-        env["pytest_version"] = _pytest.__version__
-        env["pluggy_version"] = pluggy.__version__
+        env.update(_static_environment())
         env["config"] = self.config
 
         lines = self.config.hook.pytest_report_header(
             config=self.config, start_path=self.config.rootpath
         )
         if lines:
+            # Same order as the terminal reporter outputs the header lines
+            headers: list[str] = []
             for line_or_lines in reversed(lines):
                 if isinstance(line_or_lines, str):
-                    env["plugin_report_header"] = [line_or_lines]
+                    headers.append(line_or_lines)
                 else:
-                    env["plugin_report_header"] = line_or_lines
+                    headers.extend(line_or_lines)
+            env["plugin_report_header"] = headers
 
         return env
 
@@ -213,9 +232,14 @@ class PytestRichTrace:
         self.save_output()
 
     def save_output(self) -> None:
+        saves = []
         if self.output_svg is not None:
-            self.console.save_svg(self.output_svg)
+            saves.append((self.console.save_svg, self.output_svg))
         if self.output_html is not None:
-            self.console.save_html(self.output_html)
+            saves.append((self.console.save_html, self.output_html))
         if self.output_text is not None:
-            self.console.save_text(self.output_text)
+            saves.append((self.console.save_text, self.output_text))
+
+        # Saving clears the record buffer so only release it after the last save
+        for index, (save, path) in enumerate(saves):
+            save(path, clear=index == len(saves) - 1)
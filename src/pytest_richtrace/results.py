@@ -1,9 +1,10 @@
 import traceback
+from collections import Counter
 from datetime import datetime
 from enum import StrEnum
 from typing import Type, TypeVar
 
-from pydantic import BaseModel, Field, field_serializer
+from pydantic import BaseModel, Field, PrivateAttr, computed_field, field_serializer
 
 from .item import ModuleId, NodeId
 
@@ -13,6 +14,10 @@ PerfTime = float
 E = TypeVar("E", bound=BaseException, covariant=True)
 
 
+def _format_exception(exc: BaseException) -> str:
+    return "".join(traceback.format_exception_only(type(exc), exc)).rstrip("\n")
+
+
 class TestStage(StrEnum):
     Collect = "collect"
     Setup = "setup"
@@ -85,10 +90,7 @@ class TestCollectionRecord(BaseModel):
     def serialize_exception(
         self, exc_info: dict[ModuleId, BaseException], _info
     ) -> dict[ModuleId, str]:
-        def format_exc(exc: BaseException) -> str:
-            return "".join(traceback.format_exception_only(type(exc), exc)).rstrip("\n")
-
-        return {k: format_exc(exc) for k, exc in exc_info.items()}
+        return {k: _format_exception(exc) for k, exc in exc_info.items()}
 
 
 class TestExecutionResultRecord(BaseModel):
@@ -122,8 +124,7 @@ class TestExecutionResultRecord(BaseModel):
         if exc is None:
             return ""
 
-        msg = "".join(traceback.format_exception_only(exc)).rstrip("\n")
-        return msg
+        return _format_exception(exc)
 
 
 class TestExecutionNodeRecord(BaseModel):
@@ -141,20 +142,61 @@ class TestExecutionRecord(BaseModel):
 
     nodes: dict[NodeId, TestExecutionNodeRecord] = Field(default_factory=dict)
 
-    passed: set[NodeId] = Field(default_factory=set)
-    failed: set[NodeId] = Field(default_factory=set)
-    skipped: set[NodeId] = Field(default_factory=set)
-    xfailed: set[NodeId] = Field(default_factory=set)
-    xpassed: set[NodeId] = Field(default_factory=set)
-    error: set[NodeId] = Field(default_factory=set)
+    # The outcome of each node is stored once, the per outcome sets are
+    # derived from it when they are needed
+    outcomes: dict[NodeId, TestResult] = Field(default_factory=dict, exclude=True)
+    _outcome_counts: Counter[TestResult] = PrivateAttr(default_factory=Counter)
+
+    def set_outcome(self, nodeid: NodeId, result: TestResult) -> None:
+        previous = self.outcomes.get(nodeid, None)
+        if previous is not None:
+            self._outcome_counts[previous] -= 1
+        self.outcomes[nodeid] = result
+        self._outcome_counts[result] += 1
+
+    def outcome_count(self, result: TestResult) -> int:
+        return self._outcome_counts[result]
+
+    def sorted_with_outcome(self, result: TestResult) -> list[NodeId]:
+        """The IDs of the nodes with an outcome, sorted for output"""
+        return sorted(nodeid for nodeid, r in self.outcomes.items() if r is result)
+
+    def _with_outcome(self, result: TestResult) -> set[NodeId]:
+        return {nodeid for nodeid, r in self.outcomes.items() if r is result}
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def passed(self) -> set[NodeId]:
+        return self._with_outcome(TestResult.Passed)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def failed(self) -> set[NodeId]:
+        return self._with_outcome(TestResult.Failed)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def skipped(self) -> set[NodeId]:
+        return self._with_outcome(TestResult.Skipped)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def xfailed(self) -> set[NodeId]:
+        return self._with_outcome(TestResult.XFailed)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def xpassed(self) -> set[NodeId]:
+        return self._with_outcome(TestResult.XPassed)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def error(self) -> set[NodeId]:
+        return self._with_outcome(TestResult.Error)
 
     def __rich_repr__(self):
-        yield "passed", self.passed
-        yield "failed", self.failed
-        yield "skipped", self.skipped
-        yield "xfailed", self.xfailed
-        yield "xpassed", self.xpassed
-        yield "error", self.error
+        # The outcomes in execution order, without building the outcome sets
+        yield "outcomes", self.outcomes
 
 
 class TestRunResults(BaseModel):
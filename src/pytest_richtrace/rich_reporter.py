@@ -1,10 +1,13 @@
+import functools
 import importlib
 import logging
 import platform
 import re
 import sys
+from collections.abc import Mapping
 from pathlib import Path
-from textwrap import indent, wrap
+from types import MappingProxyType
+from typing import Any
 
 import _pytest
 import pluggy  # type: ignore
@@ -14,24 +17,77 @@ import rich.box
 import rich.console
 import rich.padding
 import rich.table
+import rich.text
 import rich.theme
-import rich.traceback
-from _pytest.skipping import evaluate_skip_marks, evaluate_xfail_marks
 from _pytest.terminal import _plugin_nameversions
+from rich.console import RenderableType
+from rich.markup import escape
 from rich.padding import Padding
 
 from . import events
 from .console import (
     INDENT,
     MIN_WIDTH,
+    format_hook_info,
+    format_key,
+    format_key_value,
+    format_separator,
+    format_value,
     print_hook_info,
-    print_key,
-    print_key_value,
     print_separator,
     print_value,
 )
 from .event import SOURCE_ID_GENERATOR, Event, EventBus, EventCallback
-from .results import TestRunResults, TestStage
+from .item import NodeId, marker_names
+from .results import TestResult, TestRunResults, TestStage, XfailInfo
+
+logger = logging.getLogger(__name__)
+
+_ANSI_ESCAPE_8BIT = re.compile(
+    rb"(?:\x1B[@-Z\\-_]|[\x80-\x9A\x9C-\x9F]|(?:\x1B\[|\x9B)[0-?]*[ -/]*[@-~])"
+)
+_ANSI_ESCAPE_STR = re.compile(
+    r"(?:\x1B[@-Z\\-_]|[\x80-\x9A\x9C-\x9F]|(?:\x1B\[|\x9B)[0-?]*[ -/]*[@-~])"
+)
+
+# Stands in for a missing event payload so handlers can always call .get()
+_EMPTY_PAYLOAD: Mapping[str, Any] = MappingProxyType({})
+
+# The test stages in the order they run
+_STAGES = (TestStage.Setup, TestStage.Call, TestStage.Teardown)
+
+# Name and value column widths of the tables under a hook line
+_MARKER_COLUMNS = (15, 61)
+_COLLECT_REPORT_COLUMNS = (15, 61)
+_LOGREPORT_COLUMNS = (12, 71)
+
+
+def _key_value_table(name_width: int, value_width: int) -> rich.table.Table:
+    """A borderless two column table of names and values"""
+    table = rich.table.Table(show_header=False, show_edge=False, show_lines=False)
+    table.add_column("name", style="keyname", width=name_width)
+    table.add_column("value", width=value_width)
+    return table
+
+
+def _format_xfail_extra(xfailinfo: list[XfailInfo]) -> str:
+    """The reasons and expected exceptions of the xfail marks on a test"""
+    reasons: list[str] = []
+    raises: list[str] = []
+    for info in xfailinfo:
+        if info.reason:
+            reasons.append(info.reason)
+        if isinstance(info.raises, tuple):
+            raises.extend(exc.__name__ for exc in info.raises)
+        elif info.raises is not None:
+            raises.append(info.raises.__name__)
+
+    parts: list[str] = []
+    if reasons:
+        parts.append(f"reason={', '.join(reasons)}")
+    if raises:
+        parts.append(f"raises={', '.join(raises)}")
+    return ". ".join(parts)
 
 
 class RichReporter:
@@ -45,67 +101,70 @@ class RichReporter:
     ):
         self.config = config
         self.results = results
-        self.quiet = "quiet" in config.option
-        self.verbose = "verbose" in config.option and config.option.verbose == 1
+        self.quiet = bool(getattr(config.option, "quiet", 0))
+        self.verbose = getattr(config.option, "verbose", 0) == 1
+        self.collectonly = bool(getattr(config.option, "collectonly", False))
+        self.trace_collection = config.option.rich_trace_collection
+        self.trace_runtest = config.option.rich_trace_runtest
 
         self.source_id = source_id_generator()
         self._event_handlers = self._configure_event_handlers()
+        self._get_handler = self._event_handlers.get
         event_bus.subscribe(self.source_id, self.event_handler)
 
         self.console = console
+        # Reading the width may query the terminal size, so only do it once
+        self._console_width = console.width
 
     # region collection
 
     @pytest.hookimpl
     def pytest_itemcollected(self, item: pytest.Item) -> None:
-        logging.debug("rich_writer: pytest_itemcollected")
+        logger.debug("rich_writer: pytest_itemcollected")
 
         if self.quiet:
             return
 
-        print_hook_info(self.console, "pytest_itemcollected", item.nodeid)
+        lines: list[RenderableType] = [
+            format_hook_info("pytest_itemcollected", item.nodeid)
+        ]
 
         if not self.verbose:
+            self._print_lines(lines)
             return
 
-        print_key_value(self.console, "nodeid", item.nodeid, prefix=INDENT)
-
-        markers = list(item.iter_markers())
-
-        skip_markers = ", ".join(
-            [mark.name for mark in markers if mark.name.startswith("skip")]
-        )
+        lines.append(format_key_value("nodeid", item.nodeid, prefix=INDENT))
 
-        xfail_markers = ", ".join(
-            [mark.name for mark in markers if mark.name.startswith("xfail")]
-        )
+        skip_names: list[str] = []
+        xfail_names: list[str] = []
+        for name in marker_names(item):
+            if name.startswith("skip"):
+                skip_names.append(name)
+            elif name.startswith("xfail"):
+                xfail_names.append(name)
+        skip_markers = ", ".join(skip_names)
+        xfail_markers = ", ".join(xfail_names)
 
         if skip_markers or xfail_markers:
-            print_key(self.console, "markers", prefix=INDENT)
-            skipped = evaluate_skip_marks(item)
-            if skipped is not None:
-                table = rich.table.Table()
-                table = rich.table.Table(
-                    show_header=False, show_edge=False, show_lines=False
-                )
-                table.add_column("name", style="keyname", width=15)
-                table.add_column("value", width=61)
+            lines.append(format_key("markers", prefix=INDENT))
+
+            # The collection observer has already evaluated the marks
+            nodeid = NodeId(item.nodeid)
+            skip_infos = self.results.collect.skip.get(nodeid)
+            if skip_infos:
+                skipped = skip_infos[-1]
+                table = _key_value_table(*_MARKER_COLUMNS)
 
                 table.add_row("type", "skip")
                 table.add_row("reason", skipped.reason)
                 table.add_row("marker", skip_markers)
 
-                padding = rich.padding.Padding(table, (0, 0, 0, 8))
-                self.console.print(padding)
+                lines.append(rich.padding.Padding(table, (0, 0, 0, 8)))
 
-            xfailed = evaluate_xfail_marks(item)
-            if xfailed is not None:
-                table = rich.table.Table()
-                table = rich.table.Table(
-                    show_header=False, show_edge=False, show_lines=False
-                )
-                table.add_column("name", style="keyname", width=15)
-                table.add_column("value", width=61)
+            xfail_infos = self.results.collect.xfail.get(nodeid)
+            if xfail_infos:
+                xfailed = xfail_infos[-1]
+                table = _key_value_table(*_MARKER_COLUMNS)
 
                 table.add_row("type", "xfail")
                 table.add_row("reason", xfailed.reason)
@@ -115,8 +174,9 @@ class RichReporter:
                 table.add_row("strict", str(xfailed.strict))
                 table.add_row("marker", xfail_markers)
 
-                padding = rich.padding.Padding(table, (0, 0, 0, 8))
-                self.console.print(padding)
+                lines.append(rich.padding.Padding(table, (0, 0, 0, 8)))
+
+        self._print_lines(lines)
 
     # endregion
 
@@ -126,7 +186,7 @@ class RichReporter:
 
     # region event handling
     def event_handler(self, event: Event) -> None:
-        handler = self._event_handlers.get(event.name, None)
+        handler = self._get_handler(event.name, None)
         if handler is not None:
             handler(event)
 
@@ -135,69 +195,67 @@ class RichReporter:
         return None
 
     def _test_run_started(self, event: Event) -> None:
-        logging.debug("rich_writer: session started")
+        logger.debug("rich_writer: session started")
 
         if not self.quiet:
             print_separator(self.console, "Test Run started")
         return None
 
     def _test_run_finished(self, event: Event) -> None:
-        logging.debug("rich_writer: session finished")
+        logger.debug("rich_writer: session finished")
 
         if not self.quiet:
             print_separator(self.console, "Test Run finished")
+
+        # Nothing was run so there are no results to summarise
+        if self.collectonly:
+            return None
+
         self.print_testrun_results()
         return None
 
     def _collection_started(self, event: Event) -> None:
-        logging.debug("rich_writer: collection stage started")
+        logger.debug("rich_writer: collection stage started")
 
         if not self.quiet:
-            print_separator(self.console, "Test Collection started")
-
-            print_hook_info(self.console, "pytest_collection")
-            if event.payload and "session" in event.payload:
-                session = str(event.payload["session"])
-            else:
-                session = ""
-            print_key_value(self.console, f"{INDENT}session", session)
+            session = (event.payload or _EMPTY_PAYLOAD).get("session")
+            session_name = str(session) if session is not None else ""
+            lines: list[RenderableType] = [
+                self._separator("Test Collection started"),
+                format_hook_info("pytest_collection"),
+                format_key_value(f"{INDENT}session", session_name),
+            ]
+            self._print_lines(lines)
         return None
 
     def _collect_makereport(self, event: Event) -> None:
         """Create/Modify the collect report"""
-        logging.debug("rich_writer: pytest_make_collect_report")
+        logger.debug("rich_writer: pytest_make_collect_report")
 
         if self.quiet:
             return None
 
-        if event.payload and "collector" in event.payload:
-            nodeid = event.payload["collector"].nodeid
-        else:
-            nodeid = ""
+        collector = (event.payload or _EMPTY_PAYLOAD).get("collector")
+        nodeid = collector.nodeid if collector is not None else ""
         print_hook_info(self.console, "pytest_make_collect_report", nodeid)
         return None
 
     def _collect_start(self, event: Event) -> None:
-        logging.debug("rich_writer: pytest_collectstart")
+        logger.debug("rich_writer: pytest_collectstart")
 
         if self.quiet:
             return None
 
-        if event.payload and "collector" in event.payload:
-            nodeid = event.payload["collector"].nodeid
-        else:
-            nodeid = ""
-        print_hook_info(self.console, "pytest_collectstart", nodeid)
-
-        if not self.verbose:
-            return None
-
-        if nodeid:
-            print_key_value(self.console, "nodeid", nodeid, prefix=INDENT)
+        collector = (event.payload or _EMPTY_PAYLOAD).get("collector")
+        nodeid = collector.nodeid if collector is not None else ""
+        lines: list[RenderableType] = [format_hook_info("pytest_collectstart", nodeid)]
+        if self.verbose and nodeid:
+            lines.append(format_key_value("nodeid", nodeid, prefix=INDENT))
+        self._print_lines(lines)
         return None
 
     def _collect_file(self, event: Event) -> None:
-        logging.debug("rich_writer: pytest_collect_file")
+        logger.debug("rich_writer: pytest_collect_file")
 
         if self.quiet:
             return None
@@ -206,7 +264,7 @@ class RichReporter:
         return None
 
     def _pycollect_makemodule(self, event: Event) -> None:
-        logging.debug("rich_writer: pytest_pycollect_makemodule")
+        logger.debug("rich_writer: pytest_pycollect_makemodule")
 
         if self.quiet:
             return None
@@ -218,21 +276,22 @@ class RichReporter:
         if self.quiet:
             return None
 
-        if event.payload and "exception" in event.payload:
-            message = event.payload["exception"].msg
-        else:
-            message = ""
-        self.console.print(f"{INDENT}[error]Error collecting module[/]:")
-        self.console.print(f"{INDENT*2}[white]{event.item_id}[/]")
+        exception = (event.payload or _EMPTY_PAYLOAD).get("exception")
+        message = str(exception) if exception is not None else ""
+        lines: list[RenderableType] = [
+            f"{INDENT}[error]Error collecting module[/]:",
+            f"{INDENT*2}[white]{event.item_id}[/]",
+        ]
         if message:
-            self.console.print(f"{INDENT*2}{message}")
+            lines.append(f"{INDENT*2}{message}")
+        self._print_lines(lines)
         return None
 
     def _pycollect_makeitem(self, event: Event) -> None:
         ...
 
     def _collect_report(self, event: Event) -> None:
-        logging.debug("rich_writer: pytest_collectreport")
+        logger.debug("rich_writer: pytest_collectreport")
 
         if self.quiet:
             return None
@@ -240,13 +299,14 @@ class RichReporter:
         print_hook_info(self.console, "pytest_collectreport", event.item_id or "")
 
         if self.verbose and event.item_id:
-            if event.payload and "report" in event.payload:
-                self._print_collect_report(event.payload["report"])
+            report = (event.payload or _EMPTY_PAYLOAD).get("report")
+            if report is not None:
+                self._print_collect_report(report)
 
         return None
 
     def _collect_deselected(self, event: Event) -> None:
-        logging.debug("rich_writer: pytest_deselected")
+        logger.debug("rich_writer: pytest_deselected")
 
         if self.quiet:
             return None
@@ -257,84 +317,85 @@ class RichReporter:
         return None
 
     def _collect_modifyitems(self, event: Event) -> None:
-        logging.debug("rich_writer: pytest_collection_modifyitems")
+        logger.debug("rich_writer: pytest_collection_modifyitems")
 
         if self.quiet:
             return None
 
-        print_hook_info(self.console, "pytest_collection_modifyitems")
+        lines: list[RenderableType] = [
+            format_hook_info("pytest_collection_modifyitems")
+        ]
 
         if self.verbose:
-            if event.payload and "items" in event.payload:
-                items = event.payload["items"]
-                if not self.quiet and items:
-                    self.console.print(f"{INDENT}[keyname]items[/]:")
-                    item_text = "\n".join([f.name for f in items]).replace("[", "\\[")
-
-                    self.console.print(indent(item_text, INDENT * 2))
-                    self.console.print()
+            items = (event.payload or _EMPTY_PAYLOAD).get("items")
+            if items:
+                lines.append(f"{INDENT}[keyname]items[/]:")
+                # Item names are output as plain text, not parsed as markup
+                lines.append(
+                    rich.text.Text("\n".join(f"{INDENT * 2}{f.name}" for f in items))
+                )
+                lines.append("")
 
+        self._print_lines(lines)
         return None
 
     def _collection_finished(self, event: Event) -> None:
-        logging.debug("rich_writer: pytest_collection_finish")
+        logger.debug("rich_writer: pytest_collection_finish")
 
         if self.quiet:
             return
 
-        print_hook_info(self.console, "pytest_collection_finish", event.item_id or "")
+        lines: list[RenderableType] = [
+            format_hook_info("pytest_collection_finish", event.item_id or "")
+        ]
 
         if self.verbose:
-            if event.payload and "session" in event.payload:
-                print_key_value(
-                    self.console, "session", repr(event.payload["session"]), INDENT
-                )
-                self.console.print()
+            session = (event.payload or _EMPTY_PAYLOAD).get("session")
+            if session is not None:
+                lines.append(format_key_value("session", repr(session), INDENT))
+                lines.append("")
 
-        print_separator(self.console, "Test Collection finished")
+        lines.append(self._separator("Test Collection finished"))
+        self._print_lines(lines)
         return None
 
     def _execution_started(self, event: Event) -> None:
-        logging.debug("rich_writer: pytest_runtestloop")
+        logger.debug("rich_writer: pytest_runtestloop")
 
         if self.quiet:
             return
 
-        if not self.config.option.collectonly:
-            self.console.print()
-            print_separator(self.console, "Test Execution started")
+        if not self.collectonly:
+            self._print_lines(["", self._separator("Test Execution started")])
 
         return None
 
     def _execute_logstart(self, event: Event) -> None:
-        logging.debug("rich_writer: pytest_runtest_logstart")
+        logger.debug("rich_writer: pytest_runtest_logstart")
         if not self.quiet:
-            self.console.print()
-            print_hook_info(
-                self.console, "pytest_runtest_logstart", info=event.item_id or ""
-            )
+            lines: list[RenderableType] = [
+                "",
+                format_hook_info("pytest_runtest_logstart", info=event.item_id or ""),
+            ]
 
             if self.verbose:
-                if event.payload and "function" in event.payload:
-                    print_key_value(
-                        self.console,
-                        "function",
-                        event.payload["function"],
-                        prefix=INDENT,
-                    )
-                if event.payload and "module" in event.payload:
-                    print_key_value(
-                        self.console, "module", event.payload["module"], prefix=INDENT
-                    )
-                if event.payload and "line" in event.payload:
-                    print_key_value(
-                        self.console, "line", str(event.payload["line"]), prefix=INDENT
-                    )
+                payload = event.payload or _EMPTY_PAYLOAD
+                function = payload.get("function")
+                if function is not None:
+                    lines.append(format_key_value("function", function, prefix=INDENT))
+                module = payload.get("module")
+                if module is not None:
+                    lines.append(format_key_value("module", module, prefix=INDENT))
+                line = payload.get("line")
+                if line is not None:
+                    lines.append(format_key_value("line", str(line), prefix=INDENT))
+
+            self._print_lines(lines)
 
         return None
 
     def _execute_makereport(self, event: Event) -> None:
-        logging.debug("rich_writer: pytest_runtest_makereport")
+        logger.debug("rich_writer: pytest_runtest_makereport")
 
         if not self.quiet:
             print_hook_info(
@@ -346,83 +407,106 @@ class RichReporter:
         return None
 
     def _execute_logreport(self, event: Event) -> None:
-        logging.debug("rich_writer: pytest_runtest_logreport")
+        logger.debug("rich_writer: pytest_runtest_logreport")
 
         if not self.quiet:
+            lines: list[RenderableType] = []
             if self.verbose:
-                self.console.print()
+                lines.append("")
 
             info = event.item_id or ""
-            report = None
-            if event.payload and "report" in event.payload:
-                report = event.payload["report"]
+            report = (event.payload or _EMPTY_PAYLOAD).get("report")
 
             if report is not None:
                 if not self.verbose:
                     info += f"    when={report.when}"
 
-            print_hook_info(
-                self.console,
-                "pytest_runtest_logreport",
-                info=info,
-                prefix=INDENT,
+            lines.append(
+                format_hook_info("pytest_runtest_logreport", info=info, prefix=INDENT)
             )
-
             if self.verbose and report is not None:
-                self._print_logreport(report)
+                lines.append(self._format_logreport(report))
+            self._print_lines(lines)
         return None
 
     def _execute_logfinish(self, event: Event) -> None:
-        logging.debug("rich_writer: pytest_runtest_logfinish")
+        logger.debug("rich_writer: pytest_runtest_logfinish")
 
         if not self.quiet:
+            lines: list[RenderableType] = []
             if self.verbose:
-                self.console.print()
-            print_hook_info(
-                self.console,
-                "pytest_runtest_logfinish",
-                info=event.item_id or "",
-                prefix=INDENT,
+                lines.append("")
+            lines.append(
+                format_hook_info(
+                    "pytest_runtest_logfinish", info=event.item_id or "", prefix=INDENT
+                )
             )
+            self._print_lines(lines)
         return None
 
     def _execution_finished(self, event: Event) -> None:
-        if not self.quiet and not self.config.option.collectonly:
+        if not self.quiet and not self.collectonly:
             print_separator(self.console, "Test Execution finished")
         return None
 
     def _configure_event_handlers(self) -> dict[str, EventCallback]:
-        return {
+        if self.quiet:
+            # Only the test run results are output in quiet mode
+            return {events.TestRunFinished: self._test_run_finished}
+
+        handlers: dict[str, EventCallback] = {
             events.Environment: self._environment_received,
             events.TestRunStarted: self._test_run_started,
             events.TestRunFinished: self._test_run_finished,
-            # Collection
-            events.CollectionStarted: self._collection_started,
-            events.CollectStart: self._collect_start,
-            events.CollectMakeReport: self._collect_makereport,
-            events.CollectFile: self._collect_file,
-            events.ModuleCollectionError: self._pycollect_module_error,
-            events.ItemsDeselected: self._collect_deselected,
-            events.ModifyItems: self._collect_modifyitems,
-            events.CollectionFinished: self._collection_finished,
-            # Test Execution
-            events.ExecutionStarted: self._execution_started,
-            events.ExecuteItemStarted: self._execute_logstart,
-            events.ExecuteItemReport: self._execute_logreport,
-            events.ExecuteItemFinished: self._execute_logfinish,
-            events.ExecutionFinished: self._execution_finished,
         }
 
+        if self.trace_collection:
+            handlers.update(
+                {
+                    events.CollectionStarted: self._collection_started,
+                    events.CollectStart: self._collect_start,
+                    events.CollectMakeReport: self._collect_makereport,
+                    events.CollectFile: self._collect_file,
+                    events.ModuleCollectionError: self._pycollect_module_error,
+                    events.ItemsDeselected: self._collect_deselected,
+                    events.ModifyItems: self._collect_modifyitems,
+                    events.CollectionFinished: self._collection_finished,
+                }
+            )
+
+        if self.trace_runtest:
+            handlers.update(
+                {
+                    events.ExecutionStarted: self._execution_started,
+                    events.ExecuteItemStarted: self._execute_logstart,
+                    events.ExecuteItemSetup: self._execute_logreport,
+                    events.ExecuteItemCall: self._execute_logreport,
+                    events.ExecuteItemTeardown: self._execute_logreport,
+                    events.ExecuteItemFinished: self._execute_logfinish,
+                    events.ExecutionFinished: self._execution_finished,
+                }
+            )
+
+        return handlers
+
     # endregion
 
     # region report output
+    def _separator(self, text: str = "", color: str = "separator") -> str:
+        width = min(MIN_WIDTH, self._console_width)
+        return format_separator(text, color=color, width=width)
+
+    def _print_lines(self, lines: list[RenderableType]) -> None:
+        """Print several lines of markup or text with a single console write"""
+        self.console.print(*lines, sep="\n")
+
     def _print_environment(self) -> None:
         if self.quiet or not self.verbose:
             return None
 
-        print_key(self.console, "pytest config")
+        lines: list[RenderableType] = [format_key("pytest config")]
 
-        width = min(MIN_WIDTH - len(INDENT), self.console.width)
+        width = min(MIN_WIDTH - len(INDENT), self._console_width)
 
         table = rich.table.Table(
             width=width,
@@ -445,10 +529,8 @@ class RichReporter:
         plugin_names = ", ".join(_plugin_nameversions(plugins))
         table.add_row("plugins", plugin_names)
 
-        padding = rich.padding.Padding(table, (0, 0, 0, len(INDENT)))
-        self.console.print(padding)
-
-        self.console.print()
+        lines.append(rich.padding.Padding(table, (0, 0, 0, len(INDENT))))
+        lines.append("")
 
         table = rich.table.Table(
             width=width,
@@ -463,95 +545,65 @@ class RichReporter:
                 name = "value"
             table.add_column(name, header_style="green")
 
-        def chunk(lst, n):
-            """Yield successive n-sized chunks from lst."""
-            for i in range(0, len(lst), n):
-                yield lst[i : i + n]  # noqa
-
+        # Option names and values alternate, item_count pairs to a row
         options = vars(self.config.option)
-        keys = sorted(options.keys())
-        rows_of_keys = chunk(keys, item_count)
-        for row in rows_of_keys:
-            row_items = []
-            for key in row:
-                row_items.append(key)
-                v = options[key]
-                if isinstance(v, str):
-                    row_items.append(f'"{v}"')
-                else:
-                    row_items.append(str(v))
-            table.add_row(*row_items)
-        self.console.print(Padding(table, (0, 0, 0, len(INDENT))))
+        cells: list[str] = []
+        for key, value in sorted(options.items()):
+            cells.append(key)
+            cells.append(f'"{value}"' if isinstance(value, str) else str(value))
+
+        row_length = item_count * 2
+        for i in range(0, len(cells), row_length):
+            table.add_row(*cells[i : i + row_length])  # noqa
+        lines.append(Padding(table, (0, 0, 0, len(INDENT))))
+        self._print_lines(lines)
 
     def _print_collect_report(self, report: pytest.CollectReport) -> None:
-        print_key_value(self.console, "nodeid", report.nodeid, prefix=INDENT)
+        header = format_key_value("nodeid", report.nodeid, prefix=INDENT)
 
-        table = rich.table.Table(show_header=False, show_edge=False, show_lines=False)
-        table.add_column("name", style="keyname", width=15)
-        table.add_column("value", width=61)
+        table = _key_value_table(*_COLLECT_REPORT_COLUMNS)
 
         table.add_row("outcome", f"[{report.outcome}]{report.outcome}[/]")
 
-        if report.caplog:
-            table.add_row(
-                "caplog",
-                strip_escape_from_string(report.caplog),
-            )
-
-        if report.capstderr:
-            table.add_row(
-                "capstderr",
-                strip_escape_from_string(report.capstderr),
-            )
-
-        if report.capstdout:
-            width = self.console.width - len(INDENT) * 3
-            stdout_text = "\n".join(
-                wrap(
-                    strip_escape_from_string(report.capstdout),
-                    width=width,
-                    initial_indent=INDENT * 2,
-                    subsequent_indent=INDENT * 2,
+        # Captured output is added as plain text so it is neither parsed as
+        # markup nor wrapped until Rich renders it
+        for name, captured in (
+            ("caplog", report.caplog),
+            ("capstderr", report.capstderr),
+            ("capstdout", report.capstdout),
+        ):
+            if captured:
+                text = rich.text.Text(
+                    strip_escape_from_string(captured).strip(), overflow="fold"
                 )
-            ).strip()
-            table.add_row("capstdout", stdout_text)
+                table.add_row(name, text)
 
         padding = rich.padding.Padding(table, (0, 0, 0, 8))
-        self.console.print(padding)
-
-    def _print_logreport(self, report) -> None:
-        table = rich.table.Table(show_header=False, show_edge=False, show_lines=False)
-        table.add_column(
-            "name",
-            style="keyname",
-            width=12,
-        )
-        table.add_column("value", width=71)
+        self.console.print(header, padding)
+
+    def _format_logreport(self, report) -> RenderableType:
+        table = _key_value_table(*_LOGREPORT_COLUMNS)
 
         module, line, func = report.location
         table.add_row("when", report.when)
         table.add_row("outcome", f"[{report.outcome}]{report.outcome}[/]")
-        table.add_row("function", func.replace("[", "\\[]"))
-        table.add_row("module", module)
+        table.add_row("function", escape(func))
+        table.add_row("module", escape(module))
         table.add_row("line", str(line))
         table.add_row("start", str(report.start))
         table.add_row("finish", str(report.stop))
         table.add_row("duration", str(report.duration))
         # table.add_row("keywords", str(report.keywords))
 
-        padding = rich.padding.Padding(table, (0, 0, 0, 8))
-        self.console.print(padding)
+        return rich.padding.Padding(table, (0, 0, 0, 8))
 
     def print_testrun_results(self) -> None:
-        if self.config.option.collectonly:
-            return None
-
         if not self.quiet:
             self.console.print()
         print_separator(self.console, "Test Run results")
 
         collect_error_count = len(self.results.collect.error)
-        execute_error_count = len(self.results.execute.error)
+        execute_error_count = self.results.execute.outcome_count(TestResult.Error)
 
         self._print_counts_table(collect_error_count, execute_error_count)
 
@@ -564,19 +616,19 @@ class RichReporter:
         if execute_error_count > 0:
             self._print_execute_errors(collect_error_count)
 
-        if len(self.results.execute.failed) > 0:
+        if self.results.execute.outcome_count(TestResult.Failed) > 0:
             self._print_failed()
 
-        if len(self.results.execute.passed) > 0:
+        if self.results.execute.outcome_count(TestResult.Passed) > 0:
             self._print_passed()
 
-        if len(self.results.execute.skipped) > 0:
+        if self.results.execute.outcome_count(TestResult.Skipped) > 0:
             self._print_skipped()
 
-        if len(self.results.execute.xfailed) > 0:
+        if self.results.execute.outcome_count(TestResult.XFailed) > 0:
             self._print_xfailed()
 
-        if len(self.results.execute.xpassed) > 0:
+        if self.results.execute.outcome_count(TestResult.XPassed) > 0:
             self._print_xpassed()
 
         if len(self.results.collect.deselected) > 0:
@@ -586,34 +638,34 @@ class RichReporter:
 
     def _print_counts_table(self, collect_error_count, execute_error_count):
         error_count = collect_error_count + execute_error_count
-        failed_count = len(self.results.execute.failed)
-        passed_count = len(self.results.execute.passed)
-        skipped_count = len(self.results.execute.skipped)
-        xfailed_count = len(self.results.execute.xfailed)
-        xpassed_count = len(self.results.execute.xpassed)
+        failed_count = self.results.execute.outcome_count(TestResult.Failed)
+        passed_count = self.results.execute.outcome_count(TestResult.Passed)
+        skipped_count = self.results.execute.outcome_count(TestResult.Skipped)
+        xfailed_count = self.results.execute.outcome_count(TestResult.XFailed)
+        xpassed_count = self.results.execute.outcome_count(TestResult.XPassed)
         deselected_count = len(self.results.collect.deselected)
 
-        results_table = rich.table.Table(box=rich.box.SQUARE, border_style="dim white")
-        for column in (
-            "error",
-            "failed",
-            "passed",
-            "skipped",
-            "xfailed",
-            "xpassed",
-            "deselected",
-        ):
-            results_table.add_column(column, style=column, header_style=column)
-
-        results_table.add_row(
-            str(error_count),
-            str(failed_count),
-            str(passed_count),
-            str(skipped_count),
-            str(xfailed_count),
-            str(xpassed_count),
-            str(deselected_count),
+        counts = (
+            ("error", error_count),
+            ("failed", failed_count),
+            ("passed", passed_count),
+            ("skipped", skipped_count),
+            ("xfailed", xfailed_count),
+            ("xpassed", xpassed_count),
+            ("deselected", deselected_count),
         )
+
+        if self.quiet:
+            # A plain line is quicker to render, and to scrape, than a table
+            summary = " ".join(f"{name}={count}" for name, count in counts)
+            self.console.out(f"{INDENT}{summary}", highlight=False)
+            return
+
+        results_table = rich.table.Table(box=rich.box.SQUARE, border_style="dim white")
+        for name, _ in counts:
+            results_table.add_column(name, style=name, header_style=name)
+
+        results_table.add_row(*(str(count) for _, count in counts))
         padded_table = Padding(results_table, (0, 0, 0, len(INDENT)))
         self.console.print(padded_table)
 
@@ -621,129 +673,117 @@ class RichReporter:
         self.console.print()
         print_separator(
             self.console,
-            f"Failed ({len(self.results.execute.failed)})",
+            f"Failed ({self.results.execute.outcome_count(TestResult.Failed)})",
             color="failed",
         )
+        console = self.console
+        verbose = self.verbose
+        nodes = self.results.execute.nodes
+        print_exc = self._print_exc
         blank_line = True
-        for nodeid in sorted(self.results.execute.failed):
+        for nodeid in self.results.execute.sorted_with_outcome(TestResult.Failed):
             if blank_line:
                 blank_line = False
             else:
-                if self.verbose:
-                    self.console.print()
-
-            print_value(self.console, f"{INDENT}{nodeid}", color="failed")
-
-            if self.verbose:
-                info = self.results.execute.nodes[nodeid]
-                if info.stages[TestStage.Setup].exception is not None:
-                    self._print_exc(info.stages[TestStage.Setup].exception)
+                if verbose:
+                    console.print()
 
-                if info.stages[TestStage.Call].exception is not None:
-                    self._print_exc(info.stages[TestStage.Call].exception)
+            print_value(console, f"{INDENT}{nodeid}", color="failed")
 
-                if info.stages[TestStage.Teardown].exception is not None:
-                    self._print_exc(info.stages[TestStage.Teardown].exception)
+            if verbose:
+                stages = nodes[nodeid].stages
+                for stage in _STAGES:
+                    record = stages.get(stage)
+                    if record is not None and record.exception is not None:
+                        print_exc(record.exception)
 
     def _print_passed(self):
-        self.console.print()
-        print_separator(
-            self.console,
-            f"Passed ({len(self.results.execute.passed)})",
-            color="passed",
-        )
-        for nodeid in sorted(self.results.execute.passed):
-            print_value(self.console, nodeid, prefix=INDENT, color="passed")
+        lines = [
+            "",
+            self._separator(
+                f"Passed ({self.results.execute.outcome_count(TestResult.Passed)})",
+                color="passed",
+            ),
+        ]
+        for nodeid in self.results.execute.sorted_with_outcome(TestResult.Passed):
+            lines.append(format_value(nodeid, prefix=INDENT, color="passed"))
+        self._print_lines(lines)
 
     def _print_skipped(self):
-        self.console.print()
-        print_separator(
-            self.console,
-            f"Skipped ({len(self.results.execute.skipped)})",
-            color="skipped",
-        )
-        for nodeid in sorted(self.results.execute.skipped):
-            self.console.print(f"{INDENT}[skipped]{nodeid}[/]")
-
-            skipinfo = self.results.collect.skip.get(nodeid, None)
+        lines = [
+            "",
+            self._separator(
+                f"Skipped ({self.results.execute.outcome_count(TestResult.Skipped)})",
+                color="skipped",
+            ),
+        ]
+        skip = self.results.collect.skip
+        verbose = self.verbose
+        for nodeid in self.results.execute.sorted_with_outcome(TestResult.Skipped):
+            lines.append(f"{INDENT}[skipped]{nodeid}[/]")
+
+            skipinfo = skip.get(nodeid, None)
             extra = ""
-            if self.verbose and skipinfo is not None:
+            if verbose and skipinfo is not None:
                 reason = ", ".join([x.reason for x in skipinfo if x.reason is not None])
                 if reason:
                     extra += f"reason={reason}"
 
                 if extra:
-                    self.console.print(f"{INDENT*2}{extra}", highlight=False)
+                    lines.append(f"{INDENT*2}{extra}")
+        self._print_lines(lines)
 
     def _print_xfailed(self):
-        self.console.print()
-        print_separator(
-            self.console,
-            f"XFailed ({len(self.results.execute.xfailed)})",
-            color="xfailed",
-        )
-        for nodeid in self.results.execute.xfailed:
-            self.console.print(f"{INDENT}[xfailed]{nodeid}[/]")
-
-            xfailinfo = self.results.collect.xfail.get(nodeid, None)
-            extra = ""
-            if self.verbose and xfailinfo is not None:
-                reasons = ", ".join(
-                    [x.reason for x in xfailinfo if x.reason is not None]
-                )
-                if reasons:
-                    extra += f"reason={reasons}"
-
-                raises = ", ".join(
-                    [str(x.raises.__name__) for x in xfailinfo if x.raises is not None]
-                )
-                if raises:
-                    if extra:
-                        extra += ". "
-                    extra += f"raises={raises}"
-
+        lines = [
+            "",
+            self._separator(
+                f"XFailed ({self.results.execute.outcome_count(TestResult.XFailed)})",
+                color="xfailed",
+            ),
+        ]
+        xfail = self.results.collect.xfail
+        verbose = self.verbose
+        for nodeid in self.results.execute.sorted_with_outcome(TestResult.XFailed):
+            lines.append(f"{INDENT}[xfailed]{nodeid}[/]")
+
+            xfailinfo = xfail.get(nodeid, None)
+            if verbose and xfailinfo is not None:
+                extra = _format_xfail_extra(xfailinfo)
                 if extra:
-                    self.console.print(f"{INDENT*2}{extra}", highlight=False)
+                    lines.append(f"{INDENT*2}{extra}")
+        self._print_lines(lines)
 
     def _print_xpassed(self):
-        self.console.print()
-        print_separator(
-            self.console,
-            f"XPassed ({len(self.results.execute.xpassed)})",
-            color="xpassed",
-        )
-        for nodeid in self.results.execute.xpassed:
-            print_value(self.console, nodeid, prefix=INDENT, color="xpassed")
-
-            xfailinfo = self.results.collect.xfail.get(nodeid, None)
-            extra = ""
-            if self.verbose and xfailinfo is not None:
-                reasons = ", ".join(
-                    [x.reason for x in xfailinfo if x.reason is not None]
-                )
-                if reasons:
-                    extra += f"reason={reasons}"
-
-                raises = ", ".join(
-                    [str(x.raises.__name__) for x in xfailinfo if x.raises is not None]
-                )
-                if raises:
-                    if extra:
-                        extra += ". "
-                    extra += f"raises={raises}"
-
+        lines = [
+            "",
+            self._separator(
+                f"XPassed ({self.results.execute.outcome_count(TestResult.XPassed)})",
+                color="xpassed",
+            ),
+        ]
+        xfail = self.results.collect.xfail
+        verbose = self.verbose
+        for nodeid in self.results.execute.sorted_with_outcome(TestResult.XPassed):
+            lines.append(format_value(nodeid, prefix=INDENT, color="xpassed"))
+
+            xfailinfo = xfail.get(nodeid, None)
+            if verbose and xfailinfo is not None:
+                extra = _format_xfail_extra(xfailinfo)
                 if extra:
-                    self.console.print(f"{INDENT*2}{extra}", highlight=False)
+                    lines.append(f"{INDENT*2}{extra}")
+        self._print_lines(lines)
 
     def _print_deselected(self):
-        self.console.print()
-        print_separator(
-            self.console,
-            f"Deselected ({len(self.results.collect.deselected)})",
-            color="deselected",
-        )
+        lines = [
+            "",
+            self._separator(
+                f"Deselected ({len(self.results.collect.deselected)})",
+                color="deselected",
+            ),
+        ]
         for nodeid in self.results.collect.deselected:
-            print_value(self.console, nodeid, prefix=INDENT, color="deselected")
+            lines.append(format_value(nodeid, prefix=INDENT, color="deselected"))
+        self._print_lines(lines)
 
     def _print_execute_errors(self, collect_error_count):
         if len(self.results.collect.error) > 0:
@@ -755,7 +795,7 @@ class RichReporter:
             color="error",
         )
         print_first = True
-        for moduleid in sorted(self.results.execute.error):
+        for moduleid in self.results.execute.sorted_with_outcome(TestResult.Error):
             if print_first:
                 print_first = False
             else:
@@ -784,6 +824,10 @@ class RichReporter:
             self._print_exc(exc)
 
     def _print_exc(self, exc: BaseException):
+        # Only import the traceback renderer (and pygments) when there is an
+        # exception to show
+        import rich.traceback
+
         collector_path = Path(__file__).parent / "collector"
         width = MIN_WIDTH - len(INDENT)
         tb = rich.traceback.Traceback.from_exception(
@@ -809,21 +853,28 @@ def strip_escape(data: bytes) -> bytes:
     """Strip 7-bit and 8-bit C1 ANSI sequences
     https://stackoverflow.com/a/14693789/3253026
     """
-    ansi_escape_8bit = re.compile(
-        rb"(?:\x1B[@-Z\\-_]|[\x80-\x9A\x9C-\x9F]|(?:\x1B\[|\x9B)[0-?]*[ -/]*[@-~])"
-    )
-    return ansi_escape_8bit.sub(b"", data)
+    # Plain ASCII without an ESC cannot contain a sequence
+    if data.isascii() and b"\x1b" not in data:
+        return data
+    return _ANSI_ESCAPE_8BIT.sub(b"", data)
 
 
 def strip_escape_from_string(text: str) -> str:
-    return strip_escape(text.encode("utf-8")).decode("utf-8")
+    if text.isascii() and "\x1b" not in text:
+        return text
+    return _ANSI_ESCAPE_STR.sub("", text)
 
 
-def _remove_cwd(dirname: str) -> str:
+@functools.cache
+def _cwd() -> str:
+    return str(Path.cwd())
+
+
+def _remove_cwd(dirname: str | None) -> str | None:
     if dirname is None:
-        return
+        return None
 
-    if dirname.startswith(str(Path.cwd())):
+    if dirname.startswith(_cwd()):
         p = Path(dirname)
         return ".../" + p.name
 
@@ -1,4 +1,5 @@
 import logging
+import sys
 import time
 from datetime import datetime, timezone
 
@@ -18,6 +19,64 @@ from .results import (
     TestStage,
 )
 
+logger = logging.getLogger(__name__)
+
+# Looking the stage up is quicker than calling TestStage(when)
+_WHEN_TO_STAGE = {
+    "setup": TestStage.Setup,
+    "call": TestStage.Call,
+    "teardown": TestStage.Teardown,
+}
+
+# The event published for the report of each test stage
+_WHEN_EVENT = {
+    TestStage.Setup: events.ExecuteItemSetup,
+    TestStage.Call: events.ExecuteItemCall,
+    TestStage.Teardown: events.ExecuteItemTeardown,
+}
+
+
+# The outcomes of a pytest report. The recorded outcomes are interned so these
+# comparisons are usually an identity check, and a plain string constant is
+# much quicker to load than a TestResult member.
+_PASSED = "passed"
+_FAILED = "failed"
+_SKIPPED = "skipped"
+
+
+def _classify(
+    setup: TestExecutionResultRecord | None,
+    call: TestExecutionResultRecord | None,
+    teardown: TestExecutionResultRecord | None,
+) -> TestResult:
+    """The result of a test from the records of its stages"""
+    if setup is None:
+        return TestResult.Unknown
+
+    if call is None:
+        if setup.outcome == _SKIPPED:
+            return TestResult.Skipped
+        if setup.outcome == _FAILED:
+            return TestResult.Error
+        return TestResult.Unknown
+
+    all_passed = (
+        setup.outcome == _PASSED
+        and call.outcome == _PASSED
+        and teardown is not None
+        and teardown.outcome == _PASSED
+    )
+
+    if call.xfail:
+        return TestResult.XPassed if all_passed else TestResult.XFailed
+    if all_passed:
+        return TestResult.Passed
+    if call.outcome == _FAILED:
+        return TestResult.Failed
+    if call.outcome == _SKIPPED:
+        return TestResult.Skipped
+    return TestResult.Unknown
+
 
 class TestExecutionObserver:
     def __init__(
@@ -32,47 +91,60 @@ class TestExecutionObserver:
 
         self.source_id = source_id_generator()
         self.publisher = EventPublisher(self.source_id, event_bus)
+        self._publish = self.publisher.publish
+        self.trace = config.option.rich_trace_runtest
 
     @pytest.hookimpl
     def pytest_runtestloop(self, session: Session) -> None:
-        logging.debug("collector: pytest_runtestloop")
+        logger.debug("collector: pytest_runtestloop")
 
         self.results.execute.start = datetime.now(tz=timezone.utc)
         self.results.execute.precise_start = time.perf_counter()
 
-        self.publisher.publish(events.ExecutionStarted, item_id=session.nodeid)
+        # Skip building the event payloads when nothing would receive them
+        self.trace = (
+            self.config.option.rich_trace_runtest and self.publisher.has_subscribers()
+        )
+
+        if self.trace:
+            self._publish(events.ExecutionStarted, item_id=session.nodeid)
 
     @pytest.hookimpl
     def pytest_runtest_logstart(
         self, nodeid: str, location: tuple[str, int | None, str]
     ) -> None:
-        logging.debug("collector: pytest_runtest_logstart")
+        logger.debug("collector: pytest_runtest_logstart")
         self.results.execute.count += 1
-        self._current_execution_node = TestExecutionNodeRecord(nodeid=nodeid)
-        module, line, func = location
-        self.publisher.publish(
-            events.ExecuteItemStarted,
-            item_id=nodeid,
-            payload={
-                "module": module,
-                "line": line,
-                "function": func,
-            },
+        self._current_execution_node = TestExecutionNodeRecord.model_construct(
+            nodeid=nodeid
         )
+        module, line, func = location
+        if self.trace:
+            self._publish(
+                events.ExecuteItemStarted,
+                item_id=nodeid,
+                payload={
+                    "module": module,
+                    "line": line,
+                    "function": func,
+                },
+            )
         return None
 
     @pytest.hookimpl
     def pytest_runtest_makereport(self, item: Item, call: CallInfo[None]) -> None:
         """Runtest report"""
-        logging.debug("collector: pytest_runtest_makereport")
+        logger.debug("collector: pytest_runtest_makereport")
+        stages = self._current_execution_node.stages
         if (
             call.excinfo is not None
             and call.excinfo._excinfo is not None
-            and call.when not in self._current_execution_node.stages
+            and call.when not in stages
         ):
-            result = TestExecutionResultRecord()
-            result.exception = call.excinfo._excinfo[1]
-            self._current_execution_node.stages[TestStage(call.when)] = result
+            result = TestExecutionResultRecord.model_construct(
+                exception=call.excinfo._excinfo[1]
+            )
+            stages[_WHEN_TO_STAGE[call.when]] = result
 
     @pytest.hookimpl
     def pytest_runtest_logreport(
@@ -80,120 +152,81 @@ class TestExecutionObserver:
         report: TestReport,
     ) -> None:
         """setup, call, teardown"""
-        logging.debug("collector: pytest_runtest_logreport")
+        logger.debug("collector: pytest_runtest_logreport")
 
         if report.when is None:
             return
 
-        when = TestStage(report.when)
-        if when not in self._current_execution_node.stages:
-            result = TestExecutionResultRecord()
-            self._current_execution_node.stages[when] = result
-        else:
-            result = self._current_execution_node.stages[when]
-
-        result.xfail = hasattr(report, "wasxfail")
-        result.xdist = hasattr(report, "node")
-
-        self._current_execution_node.stages[when].precise_start = report.start
-        self._current_execution_node.stages[when].precise_finish = report.stop
-
-        self._current_execution_node.stages[when].when = report.when
-        self._current_execution_node.stages[when].outcome = report.outcome
+        when = _WHEN_TO_STAGE[report.when]
+        stages = self._current_execution_node.stages
+        # Only the exception may have been recorded by makereport
+        made = stages.get(when)
 
+        # pytest and xdist set these as instance attributes so a dict lookup
+        # is enough and cheaper than hasattr's attribute search
+        attrs = report.__dict__
         module, line, func = report.location
-        self._current_execution_node.stages[when].module = module
-        self._current_execution_node.stages[when].line = line
-        self._current_execution_node.stages[when].function = func
-
-        payload = {
-            "module": module,
-            "line": line,
-            "function": func,
-            "report": report,
-        }
-
-        if when == TestStage.Setup:
-            event = events.ExecuteItemReport
-        elif when == TestStage.Call:
-            event = events.ExecuteItemCall
-        elif when == TestStage.Teardown:
-            event = events.ExecuteItemTeardown
-
-        self.publisher.publish(
-            event,
-            item_id=report.nodeid,
-            payload=payload,
-        )
 
-        self.publisher.publish(
-            events.ExecuteItemReport,
-            item_id=report.nodeid,
-            payload=payload,
+        # Setting every field in one construct call avoids a pydantic
+        # __setattr__ call per field
+        stages[when] = TestExecutionResultRecord.model_construct(
+            outcome=sys.intern(report.outcome),
+            when=report.when,
+            function=func,
+            module=module,
+            line=line,
+            precise_start=report.start,
+            precise_finish=report.stop,
+            xfail="wasxfail" in attrs,
+            xdist="node" in attrs,
+            exception=made.exception if made is not None else None,
         )
 
-    @pytest.hookimpl
-    def pytest_runtest_logfinish(self, nodeid, location) -> None:
-        """Test ended"""
-        logging.debug("collector: pytest_runtest_logfinish")
-
-        assert self._current_execution_node.nodeid == nodeid
-        self.results.execute.nodes[
-            self._current_execution_node.nodeid
-        ] = self._current_execution_node
-        self._finalize_node(nodeid)
+        if not self.trace:
+            return
 
-        module, line, func = location
-        self.publisher.publish(
-            events.ExecuteItemFinished,
-            nodeid,
+        self._publish(
+            _WHEN_EVENT[when],
+            item_id=report.nodeid,
             payload={
                 "module": module,
                 "line": line,
                 "function": func,
+                "report": report,
             },
         )
 
-    def _finalize_node(self, nodeid):
-        logging.debug(f"collector: finalizing node {nodeid}")
+    @pytest.hookimpl
+    def pytest_runtest_logfinish(self, nodeid, location) -> None:
+        """Test ended"""
+        logger.debug("collector: pytest_runtest_logfinish")
 
         node = self._current_execution_node
-        setup = node.stages.get("setup", None)
-        call = node.stages.get("call", None)
-        teardown = node.stages.get("teardown", None)
-
-        if call is None:
-            if setup.outcome == "skipped":
-                node.result = TestResult.Skipped
-                self.results.execute.skipped.add(nodeid)
-            elif setup.outcome == TestResult.Failed:
-                node.result = TestResult.Error
-                self.results.execute.error.add(nodeid)
-            else:
-                node.result = TestResult.Unknown
-        else:
-            all_passed = all(
-                (
-                    setup.outcome == "passed",
-                    call.outcome == "passed",
-                    teardown.outcome == "passed",
-                )
+        assert node.nodeid == nodeid
+        self.results.execute.nodes[node.nodeid] = node
+        self._finalize_node(node)
+
+        module, line, func = location
+        if self.trace:
+            self._publish(
+                events.ExecuteItemFinished,
+                nodeid,
+                payload={
+                    "module": module,
+                    "line": line,
+                    "function": func,
+                },
             )
 
-            if call.xfail:
-                if all_passed:
-                    node.result = TestResult.XPassed
-                    self.results.execute.xpassed.add(nodeid)
-                else:
-                    node.result = TestResult.XFailed
-                    self.results.execute.xfailed.add(nodeid)
-            else:
-                if all_passed:
-                    node.result = TestResult.Passed
-                    self.results.execute.passed.add(nodeid)
-                else:
-                    if call.outcome == TestResult.Failed:
-                        node.result = TestResult.Failed
-                        self.results.execute.failed.add(nodeid)
-                    elif call.outcome == TestResult.Skipped:
-                        node.result = TestResult.Skipped
+    def _finalize_node(self, node: TestExecutionNodeRecord) -> None:
+        logger.debug("collector: finalizing node %s", node.nodeid)
+
+        stages = node.stages
+        setup = stages.get(TestStage.Setup)
+        call = stages.get(TestStage.Call)
+        teardown = stages.get(TestStage.Teardown)
+
+        result = _classify(setup, call, teardown)
+        node.result = result
+        if result is not TestResult.Unknown:
+            self.results.execute.set_outcome(node.nodeid, result)
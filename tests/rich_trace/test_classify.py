@@ -0,0 +1,45 @@
+from pytest_richtrace import results
+from pytest_richtrace.test_execution_observer import _classify
+
+
+def stage(outcome, xfail=False):
+    return results.TestExecutionResultRecord.model_construct(
+        outcome=outcome, xfail=xfail
+    )
+
+
+def test_classify_passed():
+    assert (
+        _classify(stage("passed"), stage("passed"), stage("passed"))
+        == results.TestResult.Passed
+    )
+
+
+def test_classify_setup_failed_is_error():
+    assert _classify(stage("failed"), None, stage("passed")) == results.TestResult.Error
+
+
+def test_classify_setup_skipped():
+    assert (
+        _classify(stage("skipped"), None, stage("passed")) == results.TestResult.Skipped
+    )
+
+
+def test_classify_xfail():
+    setup, teardown = stage("passed"), stage("passed")
+
+    assert (
+        _classify(setup, stage("skipped", xfail=True), teardown)
+        == results.TestResult.XFailed
+    )
+    assert (
+        _classify(setup, stage("passed", xfail=True), teardown)
+        == results.TestResult.XPassed
+    )
+
+
+def test_classify_call_skipped():
+    assert (
+        _classify(stage("passed"), stage("skipped"), stage("passed"))
+        == results.TestResult.Skipped
+    )
@@ -1,6 +1,8 @@
 from datetime import datetime
 
-from pytest_richtrace.event import Event, EventBus
+import pytest
+
+from pytest_richtrace.event import Event, EventBus, EventPublisher
 
 
 def test_event_list_new():
@@ -28,6 +30,16 @@ def test_event_bus_publish_id():
     assert eb.publish(ev) == "always_the_same"
 
 
+def test_event_bus_publish_default_ids():
+    eb = EventBus()
+
+    first = eb.publish(Event())
+    second = eb.publish(Event())
+
+    assert isinstance(first, int)
+    assert second > first
+
+
 def test_event_bus_publish_time():
     eb = EventBus(event_id_generator=event_id_generator, clock=clock)
 
@@ -73,3 +85,123 @@ def test_event_bus_notify():
 
     eb = EventBus()
     eb.subscribe(source="src", func=call_me)
+
+
+def test_event_bus_notify_other_sources():
+    received = []
+
+    eb = EventBus()
+    eb.subscribe(source="src", func=lambda event: received.append(("src", event)))
+    eb.subscribe(source="other", func=lambda event: received.append(("other", event)))
+
+    ev = Event()
+    ev.source = "src"
+    ev.name = "class"
+    eb.publish(ev)
+
+    assert [source for source, _ in received] == ["other"]
+    assert received[0][1].name == "class"
+
+
+def test_event_bus_no_retain():
+    eb = EventBus(retain=False)
+
+    event_id = eb.publish(Event(source="src"))
+
+    assert eb.get_with_id(event_id) is None
+    assert eb.get_from_source("src") == []
+
+
+def test_event_bus_max_events():
+    eb = EventBus(max_events=2)
+
+    ids = [eb.publish(Event(source="src")) for _ in range(3)]
+
+    assert eb.get_with_id(ids[0]) is None
+    assert [event.id for event in eb.get_from_source("src")] == ids[1:]
+
+
+def test_event_bus_get_from_source():
+    eb = EventBus()
+
+    src_id = eb.publish(Event(source="src"))
+    eb.publish(Event(source="other"))
+
+    assert [event.id for event in eb.get_from_source("src")] == [src_id]
+    assert eb.get_from_source("unknown") == []
+
+
+def test_event_bus_notify_single_subscriber():
+    received = []
+
+    eb = EventBus()
+    eb.subscribe(source="src", func=received.append)
+
+    eb.publish(Event(source="src", name="own"))
+    eb.publish(Event(source="other", name="other"))
+
+    assert [event.name for event in received] == ["other"]
+
+
+def test_event_bus_subscribe_after_publish():
+    received = []
+
+    eb = EventBus()
+    eb.subscribe(source="first", func=lambda event: received.append("first"))
+    eb.publish(Event(source="src"))
+
+    eb.subscribe(source="second", func=lambda event: received.append("second"))
+    eb.publish(Event(source="src"))
+
+    assert received == ["first", "first", "second"]
+
+
+def test_event_bus_publish_many():
+    received = []
+
+    eb = EventBus()
+    eb.subscribe(source="reporter", func=received.append)
+
+    ids = eb.publish_many(
+        [Event(source="src", name="first"), Event(source="src", name="second")]
+    )
+
+    assert ids[1] > ids[0]
+    assert [event.name for event in received] == ["first", "second"]
+    assert [event.id for event in eb.get_from_source("src")] == ids
+
+
+def test_event_publisher_publish_many():
+    eb = EventBus()
+    publisher = EventPublisher("src", eb)
+
+    ids = publisher.publish_many([("first", "here", None), ("second", None, {})])
+
+    events = eb.get_from_source("src")
+    assert [event.id for event in events] == ids
+    assert [(event.name, event.item_id) for event in events] == [
+        ("first", "here"),
+        ("second", None),
+    ]
+
+
+def test_event_bus_has_subscribers():
+    eb = EventBus()
+    assert not eb.has_subscribers("src")
+
+    eb.subscribe(source="src", func=lambda event: None)
+    assert not eb.has_subscribers("src")
+
+    eb.subscribe(source="reporter", func=lambda event: None)
+    assert eb.has_subscribers("src")
+
+
+def test_event_fields_are_keyword_only():
+    with pytest.raises(TypeError):
+        Event({"source": "src", "name": "name"})
+
+
+@pytest.mark.parametrize("max_events", [0, -1])
+def test_event_bus_max_events_must_be_positive(max_events):
+    with pytest.raises(ValueError):
+        EventBus(max_events=max_events)
@@ -0,0 +1,44 @@
+from pytest_richtrace import results
+
+
+def test_execution_record_set_outcome():
+    record = results.TestExecutionRecord()
+
+    record.set_outcome("a", results.TestResult.Passed)
+    record.set_outcome("b", results.TestResult.Failed)
+
+    assert record.passed == {"a"}
+    assert record.failed == {"b"}
+    assert record.outcome_count(results.TestResult.Passed) == 1
+
+
+def test_execution_record_change_outcome():
+    record = results.TestExecutionRecord()
+
+    record.set_outcome("a", results.TestResult.Passed)
+    record.set_outcome("a", results.TestResult.Error)
+
+    assert record.passed == set()
+    assert record.error == {"a"}
+    assert record.outcome_count(results.TestResult.Passed) == 0
+    assert record.outcome_count(results.TestResult.Error) == 1
+
+
+def test_execution_record_dump_outcome_sets():
+    record = results.TestExecutionRecord()
+
+    record.set_outcome("a", results.TestResult.XFailed)
+    data = record.model_dump()
+
+    assert data["xfailed"] == {"a"}
+    assert "outcomes" not in data
+
+
+def test_execution_record_sorted_with_outcome():
+    record = results.TestExecutionRecord()
+
+    record.set_outcome("b", results.TestResult.XPassed)
+    record.set_outcome("c", results.TestResult.Passed)
+    record.set_outcome("a", results.TestResult.XPassed)
+
+    assert record.sorted_with_outcome(results.TestResult.XPassed) == ["a", "b"]
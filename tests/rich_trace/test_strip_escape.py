@@ -0,0 +1,22 @@
+from pytest_richtrace.rich_reporter import strip_escape, strip_escape_from_string
+
+
+def test_strip_escape_bytes():
+    assert strip_escape(b"\x1b[31mred\x1b[0m") == b"red"
+
+
+def test_strip_escape_from_string():
+    assert strip_escape_from_string("\x1b[1;32mgreen\x1b[0m") == "green"
+
+
+def test_strip_escape_from_string_keeps_non_ascii():
+    assert strip_escape_from_string("\x1b[0mcafé €") == "café €"
+
+
+def test_strip_escape_plain_ascii_unchanged():
+    assert strip_escape(b"plain output") == b"plain output"
+    assert strip_escape_from_string("plain output") == "plain output"
+
+
+def test_strip_escape_from_string_c1_csi():
+    assert strip_escape_from_string("\x9b31mred") == "red"